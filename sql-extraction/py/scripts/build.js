@@ -24,7 +24,10 @@ try {
 
   // Copy Python sources to pkg for easier deployment
   console.log("Copying Python sources...");
-  fs.copyFileSync("src/py/sql_extractor.py", "pkg/sql_extractor.py");
+  fs.cpSync("src/py", "pkg/py", {
+    recursive: true,
+    filter: (src) => !src.includes("__pycache__"),
+  });
   fs.copyFileSync("src/wasm_wrapper.py", "pkg/wasm_wrapper.py");
 
   // Build TypeScript interface
@@ -2,6 +2,16 @@
 Python SQL extraction module for SQLSurge.
 """
 
-from .sql_extractor import extract_sql_list, SqlNode, CustomRawSqlQueryPy
+from .sql_extractor import (
+    extract_sql_list,
+    extract_sql_list_many,
+    SqlNode,
+    CustomRawSqlQueryPy,
+)
 
-__all__ = ["extract_sql_list", "SqlNode", "CustomRawSqlQueryPy"]
+__all__ = [
+    "extract_sql_list",
+    "extract_sql_list_many",
+    "SqlNode",
+    "CustomRawSqlQueryPy",
+]
@@ -3,86 +3,259 @@ SQL extraction from Python source code using AST parsing.
 """
 
 import ast
+import functools
+import importlib.util
 import json
-from typing import List, Dict, Any, Optional, Union
-from pydantic import BaseModel
-
-
-class Position(BaseModel):
+import os
+import re
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    List,
+    NotRequired,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+from ._ast_cache import get_tree
+
+# Line terminators as counted by the Python tokenizer
+_NEWLINE_RE = re.compile(r"\r\n?|\n")
+
+# Opening delimiters of unprefixed string literals, for str.startswith
+_TRIPLE_QUOTES = ('"""', "'''")
+_QUOTES = ('"', "'")
+
+# (start_line, start_col, end_line, end_col, content, method_line)
+_SqlNodeTuple = Tuple[int, int, int, int, str, int]
+
+# AST node classes are never subclassed, so the hot paths compare with
+# ``type(x) is ...`` against these module-level aliases
+_Call = ast.Call
+_Name = ast.Name
+_Attribute = ast.Attribute
+_Constant = ast.Constant
+_JoinedStr = ast.JoinedStr
+_BinOp = ast.BinOp
+_Add = ast.Add
+
+
+class Position(TypedDict):
     """Position in source code (0-based)."""
 
     line: int
     character: int
 
 
-class Range(BaseModel):
+class Range(TypedDict):
     """Range in source code."""
 
     start: Position
     end: Position
 
 
-class SqlNode(BaseModel):
-    """SQL node extracted from source code."""
+class SqlNode(TypedDict):
+    """
+    SQL node extracted from source code.
+
+    This is the plain dict shape returned by ``extract_sql_list``; the
+    extractor records flat tuples and builds these only at the boundary.
+    """
 
     code_range: Range
     content: str
     method_line: int  # 0-based
 
 
-class CustomRawSqlQueryPy(BaseModel):
-    """Configuration for custom SQL query extraction."""
+def _walk_calls(
+    tree: ast.AST, names: AbstractSet[str]
+) -> List[Tuple[str, ast.Call]]:
+    """
+    Collect calls to any of ``names`` in source order.
 
-    functionName: str
-    sqlArgNo: int = 1  # 1-based index, first argument is 1
-    isStringTemplate: bool = False  # For f-strings or template strings
+    Traversal and name matching are kept in one tight loop so non-matching
+    nodes never leave it; only matching calls reach the extractor.
 
+    Args:
+        tree: Parsed module
+        names: Function or method names to match
 
-class SqlExtractor(ast.NodeVisitor):
-    """AST visitor to extract SQL queries from Python code."""
+    Returns:
+        List of ``(func_name, call_node)`` tuples
+    """
+    calls = []
+    append = calls.append
+    Call = _Call
+    Name = _Name
+    Attribute = _Attribute
+    for node in ast.walk(tree):
+        if type(node) is Call:
+            func = node.func
+            func_type = type(func)
+            # Direct function calls (e.g., execute("SELECT ..."))
+            if func_type is Name:
+                if func.id in names:
+                    append((func.id, node))
+            # Method calls (e.g., cursor.execute("SELECT ..."))
+            elif func_type is Attribute:
+                if func.attr in names:
+                    append((func.attr, node))
+    # ast.walk is breadth-first; matches are few, so sorting them is cheap.
+    # The sort is stable, so an outer call keeps its place before a chained
+    # call starting at the same position
+    calls.sort(key=_call_position)
+    return calls
+
+
+def _call_position(call: Tuple[str, ast.Call]) -> Tuple[int, int]:
+    """Sort key placing matched calls in source order."""
+    node = call[1]
+    return node.lineno, node.col_offset
+
+
+class CustomRawSqlQueryPy(TypedDict):
+    """Configuration for custom SQL query extraction, as given by callers."""
 
-    def __init__(self, source_lines: List[str], configs: List[CustomRawSqlQueryPy]):
-        self.source_lines = source_lines
-        self.configs = configs
-        self.sql_nodes: List[SqlNode] = []
+    functionName: str
+    sqlArgNo: NotRequired[int]  # 1-based index, first argument is 1
+    isStringTemplate: NotRequired[bool]  # For f-strings or template strings
 
-    def visit_Call(self, node: ast.Call) -> None:
-        """Visit function call nodes."""
-        # Handle direct function calls (e.g., execute("SELECT ..."))
-        if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-            self._process_function_call(node, func_name)
 
-        # Handle method calls (e.g., cursor.execute("SELECT ..."))
-        elif isinstance(node.func, ast.Attribute):
-            func_name = node.func.attr
-            self._process_function_call(node, func_name)
+class _ParsedConfig(TypedDict):
+    """Validated ``CustomRawSqlQueryPy`` with defaults filled in."""
 
-        self.generic_visit(node)
+    functionName: str
+    sqlArgNo: int
+    isStringTemplate: bool
 
-    def _process_function_call(self, node: ast.Call, func_name: str) -> None:
-        """Process a function call that might contain SQL."""
-        for config in self.configs:
-            if func_name == config.functionName:
-                if len(node.args) >= config.sqlArgNo:
-                    sql_arg_index = config.sqlArgNo - 1
-                    sql_arg = node.args[sql_arg_index]
-
-                    # Handle string literals
-                    if isinstance(sql_arg, ast.Constant) and isinstance(
-                        sql_arg.value, str
-                    ):
-                        self._extract_sql_from_constant(sql_arg, node)
 
-                    # Handle formatted strings (f-strings)
-                    elif isinstance(sql_arg, ast.JoinedStr) and config.isStringTemplate:
-                        self._extract_sql_from_fstring(sql_arg, node)
+def _validate_config(config: Any) -> _ParsedConfig:
+    """
+    Validate a raw config mapping and fill in defaults.
+
+    Unknown keys are ignored. ``isStringTemplate`` also accepts the integers
+    0 and 1. Unlike the previous pydantic model, strings are not coerced:
+    ``"2"`` for ``sqlArgNo`` or ``"true"`` for ``isStringTemplate`` is
+    rejected, and ``extract_sql_list`` then falls back to the default configs
+    for the whole list.
 
-                    # Handle string concatenation
-                    elif isinstance(sql_arg, ast.BinOp) and isinstance(
-                        sql_arg.op, ast.Add
+    Raises:
+        TypeError: If the config or one of its fields has the wrong type
+        ValueError: If ``functionName`` is missing
+    """
+    if not isinstance(config, dict):
+        raise TypeError(f"config must be an object, got {type(config).__name__}")
+    if "functionName" not in config:
+        raise ValueError("config is missing functionName")
+    function_name = config["functionName"]
+    sql_arg_no = config.get("sqlArgNo", 1)
+    is_string_template = config.get("isStringTemplate", False)
+    if not isinstance(function_name, str):
+        raise TypeError("functionName must be a string")
+    if not isinstance(sql_arg_no, int) or isinstance(sql_arg_no, bool):
+        raise TypeError("sqlArgNo must be an integer")
+    if type(is_string_template) is int and is_string_template in (0, 1):
+        is_string_template = bool(is_string_template)
+    if not isinstance(is_string_template, bool):
+        raise TypeError("isStringTemplate must be a boolean")
+    return {
+        "functionName": function_name,
+        "sqlArgNo": sql_arg_no,
+        "isStringTemplate": is_string_template,
+    }
+
+
+class SqlExtractor:
+    """AST walker to extract SQL queries from Python code."""
+
+    def __init__(self, source_txt: str, configs: Sequence[_ParsedConfig]):
+        self.source_txt = source_txt
+        self.configs = configs
+        self.sql_nodes: List[_SqlNodeTuple] = []
+
+        # Index configs by function name so each call needs one dict lookup
+        self._by_name: Dict[str, List[_ParsedConfig]] = {}
+        for config in configs:
+            self._by_name.setdefault(config["functionName"], []).append(config)
+        self._names = frozenset(self._by_name)
+        # No config can match a call with fewer positional args than this
+        self._min_args = min((config["sqlArgNo"] for config in configs), default=1)
+        # Built on first use; files without SQL string literals never need it
+        self._line_starts: Optional[List[int]] = None
+
+    def run(self, tree: ast.AST) -> None:
+        """Walk the tree in source order and process every matching call."""
+        process = self._process_function_call
+        for func_name, node in _walk_calls(tree, self._names):
+            process(node, func_name)
+
+    def _offset(self, line: int, col: int) -> int:
+        """Convert a 0-based line and column to an offset into the source."""
+        line_starts = self._line_starts
+        if line_starts is None:
+            line_starts = self._line_starts = [0]
+            line_starts.extend(
+                m.end() for m in _NEWLINE_RE.finditer(self.source_txt)
+            )
+        return line_starts[line] + col
+
+    def _process_function_call(self, node: ast.Call, func_name: str) -> None:
+        """Process a call whose function name matches at least one config."""
+        if len(node.args) < self._min_args:
+            return
+        for config in self._by_name[func_name]:
+            sql_arg_no = config["sqlArgNo"]
+            if len(node.args) >= sql_arg_no:
+                sql_arg_index = sql_arg_no - 1
+                sql_arg = node.args[sql_arg_index]
+
+                arg_type = type(sql_arg)
+
+                # Handle string literals
+                if arg_type is _Constant and type(sql_arg.value) is str:
+                    self._extract_sql_from_constant(sql_arg, node)
+
+                # Handle formatted strings (f-strings)
+                elif arg_type is _JoinedStr and config["isStringTemplate"]:
+                    self._extract_sql_from_fstring(sql_arg, node)
+
+                # Handle string concatenation of two literals, inlined since
+                # validating the operands already does most of the work
+                elif arg_type is _BinOp and type(sql_arg.op) is _Add:
+                    left, right = sql_arg.left, sql_arg.right
+                    if (
+                        type(left) is _Constant
+                        and type(right) is _Constant
+                        and type(left.value) is str
+                        and type(right.value) is str
                     ):
-                        self._extract_sql_from_binop(sql_arg, node)
+                        sql_content = left.value + right.value
+
+                        start_line = sql_arg.lineno - 1
+                        start_col = sql_arg.col_offset
+                        end_line = (
+                            sql_arg.end_lineno - 1 if sql_arg.end_lineno else start_line
+                        )
+                        end_col = (
+                            sql_arg.end_col_offset
+                            if sql_arg.end_col_offset
+                            else start_col + len(sql_content)
+                        )
+
+                        self.sql_nodes.append(
+                            (
+                                start_line,
+                                start_col,
+                                end_line,
+                                end_col,
+                                sql_content,
+                                node.lineno - 1,
+                            )
+                        )
 
     def _extract_sql_from_constant(
         self, sql_arg: ast.Constant, call_node: ast.Call
@@ -108,7 +281,9 @@ class SqlExtractor(ast.NodeVisitor):
 
         # Adjust for quotes
         is_triple_quoted = False
-        if self.source_lines[start_line][start_col : start_col + 3] in ['"""', "'''"]:
+        source_txt = self.source_txt
+        offset = self._offset(start_line, start_col)
+        if source_txt.startswith(_TRIPLE_QUOTES, offset):
             # Triple quoted string
             start_col += 3
             # For triple quoted strings, keep the original AST end position
@@ -116,28 +291,39 @@ class SqlExtractor(ast.NodeVisitor):
             end_line = original_end_line
             end_col = original_end_col
             is_triple_quoted = True
-        elif self.source_lines[start_line][start_col] in ['"', "'"]:
+        elif source_txt.startswith(_QUOTES, offset):
             # Single or double quoted string
             start_col += 1
             end_col -= 1
 
         # For multi-line strings, adjust for leading whitespace in SQL content
         if is_triple_quoted and '\n' in sql_content:
-            # Find the first non-empty line with SQL content
-            lines = sql_content.split('\n')
-            first_content_line_idx = None
-            min_indent = float('inf')
-            
-            for i, line in enumerate(lines):
-                stripped = line.strip()
-                if stripped:  # Non-empty line
-                    if first_content_line_idx is None:
-                        first_content_line_idx = i
+            # Find the first non-empty line and the minimum indentation in a
+            # single pass, stopping as soon as an unindented line is seen
+            first_content_line_idx = -1
+            min_indent = -1
+            line_idx = 0
+            pos = 0
+            content_len = len(sql_content)
+            while True:
+                nl = sql_content.find('\n', pos)
+                line = sql_content[pos : content_len if nl < 0 else nl]
+                body = line.lstrip()
+                if body:  # Non-empty line
+                    if first_content_line_idx < 0:
+                        first_content_line_idx = line_idx
                     # Calculate indentation of this line
-                    indent = len(line) - len(line.lstrip())
-                    min_indent = min(min_indent, indent)
-            
-            if first_content_line_idx is not None and min_indent != float('inf'):
+                    indent = len(line) - len(body)
+                    if min_indent < 0 or indent < min_indent:
+                        min_indent = indent
+                        if min_indent == 0:
+                            break
+                if nl < 0:
+                    break
+                pos = nl + 1
+                line_idx += 1
+
+            if first_content_line_idx >= 0:
                 # Adjust start position to point to actual SQL content
                 # NOTE: Do NOT modify end_line and end_col here - they should remain as AST original values
                 if first_content_line_idx > 0:
@@ -159,17 +345,10 @@ class SqlExtractor(ast.NodeVisitor):
         # if 'SELECT' in sql_content:
         #     print(f"DEBUG: This is the first SQL node with SELECT")
 
-        sql_node = SqlNode(
-            code_range=Range(
-                start=Position(line=start_line, character=start_col),
-                end=Position(line=end_line, character=end_col),
-            ),
-            content=sql_content,
-            method_line=method_line,
+        self.sql_nodes.append(
+            (start_line, start_col, end_line, end_col, sql_content, method_line)
         )
 
-        self.sql_nodes.append(sql_node)
-
     def _extract_sql_from_fstring(
         self, sql_arg: ast.JoinedStr, call_node: ast.Call
     ) -> None:
@@ -197,54 +376,57 @@ class SqlExtractor(ast.NodeVisitor):
 
         method_line = call_node.lineno - 1
 
-        sql_node = SqlNode(
-            code_range=Range(
-                start=Position(line=start_line, character=start_col),
-                end=Position(line=end_line, character=end_col),
-            ),
-            content=sql_content,
-            method_line=method_line,
+        self.sql_nodes.append(
+            (start_line, start_col, end_line, end_col, sql_content, method_line)
         )
 
-        self.sql_nodes.append(sql_node)
 
-    def _extract_sql_from_binop(self, sql_arg: ast.BinOp, call_node: ast.Call) -> None:
-        """Extract SQL from binary operations (string concatenation)."""
-        # This is a simplified version - could be extended for complex concatenations
-        if isinstance(sql_arg.left, ast.Constant) and isinstance(
-            sql_arg.right, ast.Constant
-        ):
-            if isinstance(sql_arg.left.value, str) and isinstance(
-                sql_arg.right.value, str
-            ):
-                sql_content = sql_arg.left.value + sql_arg.right.value
-
-                start_line = sql_arg.lineno - 1
-                start_col = sql_arg.col_offset
-                end_line = sql_arg.end_lineno - 1 if sql_arg.end_lineno else start_line
-                end_col = (
-                    sql_arg.end_col_offset
-                    if sql_arg.end_col_offset
-                    else start_col + len(sql_content)
-                )
-
-                method_line = call_node.lineno - 1
-
-                sql_node = SqlNode(
-                    code_range=Range(
-                        start=Position(line=start_line, character=start_col),
-                        end=Position(line=end_line, character=end_col),
-                    ),
-                    content=sql_content,
-                    method_line=method_line,
-                )
-
-                self.sql_nodes.append(sql_node)
+# Default configurations for common Python SQL libraries
+_DEFAULT_CONFIGS: Tuple[_ParsedConfig, ...] = tuple(
+    _validate_config({"functionName": name, "sqlArgNo": 1})
+    for name in (
+        "execute",
+        "executemany",
+        "query",
+        "raw",  # Django ORM
+        "text",  # SQLAlchemy
+        "raw_sql",  # Custom raw_sql function
+    )
+)
+
+
+def _configs_key(configs: List[Any]) -> Tuple[Any, ...]:
+    """
+    Build a hashable cache key from a list of config dicts or JSON strings.
+
+    Dict values are keyed together with their type, since ``True == 1 == 1.0``
+    would otherwise let a config that fails validation hit the cache entry of
+    one that passed.
+    """
+    return tuple(
+        frozenset((k, type(v), v) for k, v in config.items())
+        if isinstance(config, dict)
+        else config
+        for config in configs
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_configs(key: Tuple[Any, ...]) -> Tuple[_ParsedConfig, ...]:
+    """Parse configs from a cache key built by ``_configs_key``."""
+    return tuple(
+        _validate_config({k: v for k, _, v in config})
+        if isinstance(config, frozenset)
+        else _validate_config(config)
+        if isinstance(config, dict)
+        else _validate_config(json.loads(config))
+        for config in key
+    )
 
 
 def extract_sql_list(
     source_txt: str, configs: Optional[List[Dict[str, Any]]] = None
-) -> List[Dict[str, Any]]:
+) -> List[SqlNode]:
     """
     Extract SQL queries from Python source code.
 
@@ -253,43 +435,69 @@ def extract_sql_list(
         configs: List of configuration dictionaries for custom SQL extraction
 
     Returns:
-        List of serialized SqlNode objects
+        List of SqlNode dicts
     """
-    # Default configurations for common Python SQL libraries
-    default_configs = [
-        CustomRawSqlQueryPy(functionName="execute", sqlArgNo=1),
-        CustomRawSqlQueryPy(functionName="executemany", sqlArgNo=1),
-        CustomRawSqlQueryPy(functionName="query", sqlArgNo=1),
-        CustomRawSqlQueryPy(functionName="raw", sqlArgNo=1),  # Django ORM
-        CustomRawSqlQueryPy(functionName="text", sqlArgNo=1),  # SQLAlchemy
-        CustomRawSqlQueryPy(functionName="raw_sql", sqlArgNo=1),  # Custom raw_sql function
-    ]
-
     # Parse custom configurations if provided
-    parsed_configs = default_configs
+    parsed_configs = _DEFAULT_CONFIGS
     if configs:
         try:
-            parsed_configs = [
-                CustomRawSqlQueryPy(**config)
-                if isinstance(config, dict)
-                else CustomRawSqlQueryPy.parse_obj(json.loads(config))
-                for config in configs
-            ]
+            try:
+                key = _configs_key(configs)
+                hash(key)
+            except TypeError:
+                # Unhashable config values; parse without memoizing
+                parsed_configs = _parse_configs.__wrapped__(tuple(configs))
+            else:
+                parsed_configs = _parse_configs(key)
         except Exception as e:
             print(f"Failed to parse configurations: {e}")
-            parsed_configs = default_configs
+            parsed_configs = _DEFAULT_CONFIGS
 
     try:
+        # Accept bytes like ast.parse does, honouring any coding cookie
+        if isinstance(source_txt, bytes):
+            source_txt = importlib.util.decode_source(source_txt)
+
+        # A call can only match if its function name appears in the text, so
+        # skip parsing entirely when none do. Names inside strings or comments
+        # only cost the normal parse. Only plain ASCII text is filtered: the
+        # parser NFKC-normalizes identifiers, so e.g. a fullwidth "ｅxecute"
+        # still names execute, and non-str input is left to the parser.
+        if (
+            isinstance(source_txt, str)
+            and source_txt.isascii()
+            and not any(
+                config["functionName"] in source_txt for config in parsed_configs
+            )
+        ):
+            return []
+
         # Parse the source code
-        tree = ast.parse(source_txt)
-        source_lines = source_txt.splitlines()
+        tree = get_tree(source_txt)
 
         # Extract SQL nodes
-        extractor = SqlExtractor(source_lines, parsed_configs)
-        extractor.visit(tree)
-
-        # Return serialized SQL nodes
-        return [node.dict() for node in extractor.sql_nodes]
+        extractor = SqlExtractor(source_txt, parsed_configs)
+        extractor.run(tree)
+
+        # Materialize the nested SqlNode shape once, at the boundary
+        return [
+            {
+                "code_range": {
+                    "start": {"line": start_line, "character": start_col},
+                    "end": {"line": end_line, "character": end_col},
+                },
+                "content": content,
+                "method_line": method_line,
+            }
+            for (
+                start_line,
+                start_col,
+                end_line,
+                end_col,
+                content,
+                method_line,
+            ) in extractor.sql_nodes
+        ]
 
     except SyntaxError as e:
         print(f"Failed to parse Python source code: {e}")
@@ -297,3 +505,46 @@ def extract_sql_list(
     except Exception as e:
         print(f"Error during SQL extraction: {e}")
         return []
+
+
+def extract_sql_list_many(
+    sources: Sequence[str],
+    configs: Optional[List[Dict[str, Any]]] = None,
+    workers: Optional[int] = None,
+) -> List[List[SqlNode]]:
+    """
+    Extract SQL queries from many Python sources in parallel.
+
+    Sources are sharded across worker processes; parsing holds the GIL, so
+    processes scale where threads would not. Falls back to running serially
+    when only one worker is requested or processes are unavailable (e.g.
+    under Pyodide).
+
+    Args:
+        sources: Python source code strings
+        configs: List of configuration dictionaries for custom SQL extraction
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        One list of SqlNode dicts per source, in input order
+    """
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+    if workers <= 1:
+        return [extract_sql_list(source_txt, configs) for source_txt in sources]
+
+    extract = functools.partial(extract_sql_list, configs=configs)
+    chunksize = max(1, len(sources) // (4 * workers))
+    try:
+        from concurrent.futures.process import BrokenProcessPool, ProcessPoolExecutor
+    except ImportError as e:
+        print(f"Process pool unavailable, extracting serially: {e}")
+        return [extract(source_txt) for source_txt in sources]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(extract, sources, chunksize=chunksize))
+    except (BrokenProcessPool, NotImplementedError, OSError) as e:
+        # Also covers workers dying or failing to start (e.g. spawn without
+        # a __main__ guard)
+        print(f"Process pool failed, extracting serially: {e}")
+        return [extract(source_txt) for source_txt in sources]
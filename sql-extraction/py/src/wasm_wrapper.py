@@ -3,19 +3,61 @@ WASM wrapper for Python SQL extractor.
 This module provides a JavaScript-compatible interface.
 """
 
+import functools
 import json
+import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from py.sql_extractor import extract_sql_list as _extract_sql_list
+    import orjson
 except ImportError:
-    from sql_extractor import extract_sql_list as _extract_sql_list
+    orjson = None
+
+from py.sql_extractor import extract_sql_list as _extract_sql_list
+
+
+_DEFAULT_CACHE_SIZE = 256
+
+
+def _cache_size() -> int:
+    """Read the result cache size from the environment, ignoring bad values."""
+    value = os.environ.get("SQLSURGE_WASM_CACHE_SIZE")
+    if value is None:
+        return _DEFAULT_CACHE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = -1
+    if size < 0:
+        print(
+            f"Invalid SQLSURGE_WASM_CACHE_SIZE {value!r}, "
+            f"using {_DEFAULT_CACHE_SIZE}"
+        )
+        return _DEFAULT_CACHE_SIZE
+    return size
+
+
+_CACHE_SIZE = _cache_size()
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to JSON, using orjson when it is available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # e.g. lone surrogates, which the stdlib encoder escapes
+            pass
+    return json.dumps(obj)
 
 
 def extract_sql_list(source_txt: str, configs: Optional[str] = None) -> str:
     """
     Extract SQL queries from Python source code (WASM-compatible version).
 
+    Results are memoized per ``(source_txt, configs)``; call ``cache_clear()``
+    to drop them, e.g. when the extractor configuration changes.
+
     Args:
         source_txt: Python source code as string
         configs: JSON string of configuration list (optional)
@@ -24,17 +66,28 @@ def extract_sql_list(source_txt: str, configs: Optional[str] = None) -> str:
         JSON string of serialized SqlNode list
     """
     try:
-        parsed_configs = None
-        if configs:
-            parsed_configs = json.loads(configs)
-
-        results = _extract_sql_list(source_txt, parsed_configs)
-        return json.dumps(results)
-
+        return _cached(source_txt, configs or None)
     except Exception as e:
+        # Handled outside the cached helper so failures are never memoized
         print(f"Error in extract_sql_list: {e}")
-        return json.dumps([])
+        return "[]"
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _cached(source_txt: str, configs: Optional[str]) -> str:
+    """Run the extraction and serialize the result to JSON; errors propagate."""
+    parsed_configs = None
+    if configs:
+        parsed_configs = json.loads(configs)
+
+    results = _extract_sql_list(source_txt, parsed_configs)
+    return _dumps(results)
+
+
+def cache_clear() -> None:
+    """Drop all memoized extraction results."""
+    _cached.cache_clear()
 
 
 # Export for JavaScript
-__all__ = ["extract_sql_list"]
+__all__ = ["extract_sql_list", "cache_clear"]